@@ -6,6 +6,7 @@ TODO:
 - Experiment with id compression
 """
 
+import io
 import json
 import sys
 import pathlib
@@ -13,21 +14,34 @@ import cbor2
 import datetime
 import re
 import hashlib
+import functools
 
-class Schema:
-    labels = {}
-    enums = {}
-    consts = {}
+try:
+    import orjson
+
+    load_json = orjson.loads
+except ImportError:
+    load_json = json.loads
+
+SCHEMA_ENTRY = re.compile(
+    r"^\s*(label|const)\.([^=\s]+)\s*=\s*(.+?)\s*$", re.MULTILINE
+)
 
+class LabelDict(dict):
+    # Keys without a label are kept as-is
+    def __missing__(self, key):
+        return key
+
+class Schema:
     def __init__(self, schema_path: pathlib.Path):
-        for line in schema_path.read_text().splitlines():
-            line = line.strip()
-            if line.startswith("label."):
-                label, value = line[len("label.") :].split("=")
-                self.labels[label.strip()] = int(value.strip())
-            elif line.startswith("const."):
-                const, value = line[len("const.") :].split("=")
-                self.consts[const.strip()] = value.strip()
+        self.labels = LabelDict()
+        self.enums = {}
+        self.consts = {}
+        for kind, name, value in SCHEMA_ENTRY.findall(schema_path.read_text()):
+            if kind == "label":
+                self.labels[name] = int(value)
+            else:
+                self.consts[name] = sys.intern(value)
         # SPDX generated by microsoft/sbom-tool still appears to use
         # SPDX-2.2 constants, so this is a workaround to map them correctly.
         spdx_2_2_consts = {}
@@ -35,6 +49,28 @@ class Schema:
             spdx_2_2_consts[re.sub("([A-Z])", r"_\1", const).upper()] = value
         spdx_2_2_consts["NOASSERTION"] = spdx_2_2_consts["NO_ASSERTION"]
         self.consts.update(spdx_2_2_consts)
+        # Converters are resolved once per key, rather than re-examining the key
+        # for every value in the document.
+        self._handler_cache = {None: self._resolve(None)}
+        for label in self.labels:
+            self._handler_cache[label] = self._resolve(label)
+
+    def _resolve(self, key):
+        if key == "hashValue":
+            return bytes.fromhex
+        if key is not None and (key == "created" or key.endswith("Time")):
+            return iso_to_cbortag
+        return self._convert_string
+
+    def _convert_string(self, value):
+        if isinstance(value, str):
+            mapped_value = self.consts.get(value)
+            if mapped_value is not None:
+                return mapped_value
+            # microsoft/sbom-tool uses SPDXRef- prefixed-UUIDs in text that are quite large
+            if value.startswith("SPDXRef-"):
+                return hashlib.sha256(value.encode("utf-8")).digest()
+        return value
 
 class InternedStrings:
     def __init__(self, offset, active):
@@ -60,55 +96,105 @@ class InternedStrings:
     
 INTERNED_STRINGS = InternedStrings(0, True)
 
+# Documents tend to repeat the same few timestamps across many elements
+@functools.lru_cache(maxsize=4096)
+def iso_to_cbortag(value):
+    return cbor2.CBORTag(
+        1,
+        int(
+            datetime.datetime.fromisoformat(
+                value.replace("Z", "+00:00")
+            ).timestamp()
+        ),
+    )
+
 def simple_value_convert(key, value, schema):
-    if key is not None and key == "hashValue":
-        return bytes.fromhex(value)
-    if key is not None and (key == "created" or key.endswith("Time")):
-        return cbor2.CBORTag(
-            1,
-            int(
-                datetime.datetime.fromisoformat(
-                    value.replace("Z", "+00:00")
-                ).timestamp()
-            ),
-        )
-    if isinstance(value, str):
-        if value in schema.consts:
-            return schema.consts[value]
-        else:
-            # microsoft/sbom-tool uses SPDXRef- prefixed-UUIDs in text that are quite large
-            if value.startswith("SPDXRef-"):
-                return hashlib.sha256(value.encode("utf-8")).digest()
-    return value
+    handler = schema._handler_cache.get(key)
+    if handler is None:
+        handler = schema._resolve(key)
+        schema._handler_cache[key] = handler
+    return handler(value)
+
+def _children(node):
+    # Dicts are rebuilt in place: their items are snapshotted before clearing,
+    # so that relabelled keys can be re-inserted in their original order.
+    if type(node) is dict:
+        items = list(node.items())
+        node.clear()
+        return iter(items)
+    return enumerate(node)
+
 
 def mapped(document, schema):
-    map = {}
-    for key, value in document.items():
-        val = value
-        if isinstance(value, dict):
-            val = mapped(value, schema)
-        elif isinstance(value, list):
-            val = [
-                mapped(item, schema) if isinstance(item, dict) else simple_value_convert(None, item, schema)
-                for item in value
-            ]
-        converted_value = simple_value_convert(key, val, schema)
-        if isinstance(converted_value, str):
-            map[schema.labels.get(key, key)] = INTERNED_STRINGS.get(converted_value)
+    # Walks the document depth-first with an explicit stack, converting it in
+    # place. Values are visited in the same order as a recursive walk would,
+    # which keeps the interned string indices stable.
+    label_of = schema.labels.__getitem__
+    convert_item = schema._handler_cache[None]
+    stack = [(document, _children(document))]
+    while stack:
+        node, children = stack[-1]
+        in_dict = type(node) is dict
+        for key, value in children:
+            if in_dict and type(value) is list and dict not in map(type, value):
+                # Lists of scalars, such as element references, are converted
+                # in one go rather than item by item on the stack
+                node[label_of(key)] = [
+                    convert_item(
+                        sys.intern(item)
+                        if type(item) is str and len(item) < 128
+                        else item
+                    )
+                    for item in value
+                ]
+                continue
+            if type(value) is dict or (in_dict and type(value) is list):
+                if in_dict:
+                    node[label_of(key)] = value
+                stack.append((value, _children(value)))
+                break
+            # Identifiers and license references recur throughout documents,
+            # interning them makes subsequent hashing and comparisons cheaper.
+            if type(value) is str and len(value) < 128:
+                value = sys.intern(value)
+            if in_dict:
+                converted_value = simple_value_convert(key, value, schema)
+                if isinstance(converted_value, str):
+                    node[label_of(key)] = INTERNED_STRINGS.get(converted_value)
+                else:
+                    node[label_of(key)] = converted_value
+            else:
+                node[key] = simple_value_convert(None, value, schema)
         else:
-            map[schema.labels.get(key, key)] = converted_value
-    return map
+            stack.pop()
+    return document
 
 
-def convert(document_path, schema_path, string_referencing=False):
-    document = json.loads(document_path.read_text())
-    schema = Schema(schema_path)
+def convert_bytes(document_bytes, schema, string_referencing=False, output=None):
+    document = load_json(document_bytes)
     INTERNED_STRINGS.reset()
     mapped_doc = mapped(document, schema)
     if INTERNED_STRINGS.active:
         # print(f"Total interned strings: {len(INTERNED_STRINGS.entries)}")
         mapped_doc[2000] = INTERNED_STRINGS.entries
-    return cbor2.dumps(mapped_doc, string_referencing=string_referencing)
+    # Encode straight into the output when one is given, rather than through an
+    # intermediate bytes object.
+    out = io.BytesIO() if output is None else output
+    cbor2.CBOREncoder(out, string_referencing=string_referencing).encode(mapped_doc)
+    if output is None:
+        return out.getvalue()
+
+
+def convert_with_schema(document_path, schema, string_referencing=False, output=None):
+    return convert_bytes(
+        document_path.read_bytes(), schema, string_referencing, output
+    )
+
+
+def convert(document_path, schema_path, string_referencing=False, output=None):
+    return convert_with_schema(
+        document_path, Schema(schema_path), string_referencing, output
+    )
 
 
 if __name__ == "__main__":
@@ -120,4 +206,4 @@ if __name__ == "__main__":
         print("Usage: conv.py <spdx3.json> <output.cbor> <schema.cddl>")
         sys.exit(1)
     with output_path.open("wb") as fd:
-        fd.write(convert(input_path, schema_path))
+        convert(input_path, schema_path, output=fd)
@@ -1,12 +1,53 @@
 #!/usr/bin/env python3
 
 from collections import defaultdict
-from conv import convert
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from conv import Schema, convert_bytes
 import os
 import pathlib
 import lzma
 import subprocess
 
+# Set in each worker process by init_worker
+SCHEMA = None
+COMPRESSOR = None
+
+
+def init_worker(schema_path):
+    global SCHEMA, COMPRESSOR
+    SCHEMA = Schema(schema_path)
+    # lzma releases the GIL, so compression can overlap with conversion
+    COMPRESSOR = ThreadPoolExecutor(max_workers=1)
+
+
+def process_one(file_path):
+    try:
+        # Read once, so that all measurements are made on the same contents
+        spdx_json = file_path.read_bytes()
+        lzma_compressed = COMPRESSOR.submit(lzma.compress, spdx_json)
+        # Started early so that interpreter startup overlaps with conversion
+        with subprocess.Popen(
+            ["json2cbor.rb", "-p"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        ) as json2cbor:
+            converted = convert_bytes(spdx_json, SCHEMA)
+            # converted_with_string_refs = convert_bytes(
+            #     spdx_json, SCHEMA, string_referencing=True
+            # )
+            cbor_packed, _ = json2cbor.communicate(spdx_json)
+        file_size = len(spdx_json)
+        converted_size = len(converted)
+        # converted_size_with_string_refs = len(converted_with_string_refs)
+        packed_size = len(cbor_packed)
+        lzma_size = len(lzma_compressed.result())
+        return file_size, converted_size, lzma_size, packed_size
+    except Exception as e:
+        # Only the message is sent back, as not every exception can be pickled
+        return str(e)
+
+
 if __name__ == "__main__":
     samples_dir = pathlib.Path("samples")
     schema_path = pathlib.Path("../cospdx.cddl")
@@ -14,40 +55,35 @@ if __name__ == "__main__":
     sbom_tool = defaultdict(list)
     spdx_samples = defaultdict(list)
 
+    tasks = []
     for root, dirs, files in os.walk(samples_dir):
         for file in sorted(files):
             if file.endswith(".json") and not root.endswith("ccf"):
-                file_path = pathlib.Path(root) / file
-                try:
-                    converted = convert(file_path, schema_path)
-                    # converted_with_string_refs = convert(
-                    #     file_path, schema_path, string_referencing=True
-                    # )
-                    file_size = file_path.stat().st_size
-                    converted_size = len(converted)
-                    # converted_size_with_string_refs = len(converted_with_string_refs)
-                    spdx_json = file_path.read_text()
-                    lzma_compressed = lzma.compress(spdx_json.encode())
-                    lzma_size = len(lzma_compressed)
-                    cbor_packed = subprocess.run(
-                        ["json2cbor.rb", "-p", str(file_path)],
-                        capture_output=True,
-                    )
-                    packed_size = len(cbor_packed.stdout)
-                    print(
-                        f"{str(file_path):<64}: JSON: {str(file_size):<8} CoSPDX: {str(converted_size):<8}  Ratio: {converted_size / file_size:.2f} Packed CoSPDX: {packed_size / file_size:.2f} LZMA: {lzma_size / file_size:.2f}"
-                    )
-                    if "sbom-tool" in root:
-                        sbom_tool["CoSPDX Ratios"].append(converted_size / file_size)
-                        sbom_tool["LZMA Ratios"].append(lzma_size / file_size)
-                        sbom_tool["Packed CoSPDX Ratios"].append(packed_size / file_size)
-                    else:
-                        spdx_samples["CoSPDX Ratios"].append(converted_size / file_size)
-                        spdx_samples["LZMA Ratios"].append(lzma_size / file_size)
-                        spdx_samples["Packed CoSPDX Ratios"].append(packed_size / file_size)
-                except Exception as e:
-                    print(f"Error processing {file_path}: {e}")
-    
+                tasks.append(pathlib.Path(root) / file)
+
+    # Samples are independent of each other, so they are processed in parallel
+    with ProcessPoolExecutor(
+        max_workers=os.cpu_count(), initializer=init_worker, initargs=(schema_path,)
+    ) as executor:
+        for file_path, result in zip(
+            tasks, executor.map(process_one, tasks, chunksize=4)
+        ):
+            if isinstance(result, str):
+                print(f"Error processing {file_path}: {result}")
+                continue
+            file_size, converted_size, lzma_size, packed_size = result
+            print(
+                f"{str(file_path):<64}: JSON: {str(file_size):<8} CoSPDX: {str(converted_size):<8}  Ratio: {converted_size / file_size:.2f} Packed CoSPDX: {packed_size / file_size:.2f} LZMA: {lzma_size / file_size:.2f}"
+            )
+            if "sbom-tool" in str(file_path.parent):
+                sbom_tool["CoSPDX Ratios"].append(converted_size / file_size)
+                sbom_tool["LZMA Ratios"].append(lzma_size / file_size)
+                sbom_tool["Packed CoSPDX Ratios"].append(packed_size / file_size)
+            else:
+                spdx_samples["CoSPDX Ratios"].append(converted_size / file_size)
+                spdx_samples["LZMA Ratios"].append(lzma_size / file_size)
+                spdx_samples["Packed CoSPDX Ratios"].append(packed_size / file_size)
+
     print()
     print("SPDX Samples Averages:")
     for key, values in spdx_samples.items():
@@ -9,6 +9,9 @@ import re
 import random
 import string
 
+# Both patterns use the stdlib engine: the PCRE one needs a lookahead, which
+# linear-time engines such as RE2 do not support.
+
 # PCRE pattern (with anchoring to match XSD behavior)
 PCRE_PATTERN = re.compile(r"^(?!_:).+:.+$")
 
@@ -16,12 +19,14 @@ PCRE_PATTERN = re.compile(r"^(?!_:).+:.+$")
 XSD_PATTERN = re.compile(r"^([^_].*:.+|_[^:].*:.+)$")
 
 
+# Include characters that are interesting for our patterns
+CHARS = string.ascii_letters + string.digits + "_:.-/"
+
+
 def generate_random_string(max_len=20):
     """Generate a random string with various characters."""
     length = random.randint(0, max_len)
-    # Include characters that are interesting for our patterns
-    chars = string.ascii_letters + string.digits + "_:.-/"
-    return "".join(random.choice(chars) for _ in range(length))
+    return "".join(random.choices(CHARS, k=length))
 
 
 def generate_edge_case_strings():
@@ -61,11 +66,19 @@ def generate_edge_case_strings():
     return cases
 
 
-def test_string(s):
+def test_string(s, _pcre_match=PCRE_PATTERN.fullmatch, _xsd_match=XSD_PATTERN.fullmatch):
     """Test a string against both patterns and return results."""
-    pcre_match = bool(PCRE_PATTERN.match(s))
-    xsd_match = bool(XSD_PATTERN.match(s))
-    return pcre_match, xsd_match
+    # Match methods are bound as defaults, this is called for every fuzz input
+    return _pcre_match(s) is not None, _xsd_match(s) is not None
+
+
+def find_failures(strings):
+    """Test a batch of strings, and return those the patterns disagree on."""
+    return [
+        (s, pcre_match, xsd_match)
+        for s, (pcre_match, xsd_match) in zip(strings, map(test_string, strings))
+        if pcre_match != xsd_match
+    ]
 
 
 def main():
@@ -93,39 +106,23 @@ def main():
     # Random fuzzing
     num_random = 100000
     print(f"\nRunning {num_random} random tests...")
-    for i in range(num_random):
-        s = generate_random_string()
-        total_tests += 1
-        pcre_match, xsd_match = test_string(s)
-        if pcre_match != xsd_match:
-            failures.append((s, pcre_match, xsd_match))
+    strings = [generate_random_string() for _ in range(num_random)]
+    total_tests += len(strings)
+    failures.extend(find_failures(strings))
 
     # Also generate strings that are more likely to be interesting
     print("Running targeted random tests...")
-    for _ in range(50000):
-        # Strings starting with _
-        s = "_" + generate_random_string(15)
-        total_tests += 1
-        pcre_match, xsd_match = test_string(s)
-        if pcre_match != xsd_match:
-            failures.append((s, pcre_match, xsd_match))
-
-    for _ in range(50000):
-        # Strings with colons
-        parts = [generate_random_string(5) for _ in range(random.randint(2, 4))]
-        s = ":".join(parts)
-        total_tests += 1
-        pcre_match, xsd_match = test_string(s)
-        if pcre_match != xsd_match:
-            failures.append((s, pcre_match, xsd_match))
-
-    for _ in range(50000):
-        # Strings starting with _:
-        s = "_:" + generate_random_string(10)
-        total_tests += 1
-        pcre_match, xsd_match = test_string(s)
-        if pcre_match != xsd_match:
-            failures.append((s, pcre_match, xsd_match))
+    # Strings starting with _
+    strings = ["_" + generate_random_string(15) for _ in range(50000)]
+    # Strings with colons
+    strings += [
+        ":".join([generate_random_string(5) for _ in range(random.randint(2, 4))])
+        for _ in range(50000)
+    ]
+    # Strings starting with _:
+    strings += ["_:" + generate_random_string(10) for _ in range(50000)]
+    total_tests += len(strings)
+    failures.extend(find_failures(strings))
 
     # Report results
     print("\n" + "=" * 50)
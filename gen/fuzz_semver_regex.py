@@ -10,6 +10,8 @@ import re
 import random
 import string
 import sys
+from functools import partial
+from multiprocessing import Pool
 from typing import Tuple, List
 
 # PCRE version (original)
@@ -19,19 +21,22 @@ PCRE_PATTERN = r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:-((?:0|[1-9]\d*|\d*
 # Main differences: \d -> [0-9], (?:...) -> (...)
 XSD_PATTERN = r"^(0|[1-9][0-9]*)\.(0|[1-9][0-9]*)\.(0|[1-9][0-9]*)(-((0|[1-9][0-9]*|[0-9]*[a-zA-Z-][0-9a-zA-Z-]*)(\.(0|[1-9][0-9]*|[0-9]*[a-zA-Z-][0-9a-zA-Z-]*))*))?(\+([0-9a-zA-Z-]+(\.[0-9a-zA-Z-]+)*))?$"
 
-# Compile both patterns
+# Compile both patterns. Both are regular, but the stdlib engine is kept: the
+# inputs are short, and per-call overhead of the RE2 bindings dominates there.
+# Matching both at once with an re2.Set is no faster on the fuzz inputs, most
+# of which are rejected within their first few characters.
 pcre_regex = re.compile(PCRE_PATTERN)
 xsd_regex = re.compile(XSD_PATTERN)
 
 
 def matches_pcre(s: str) -> bool:
     """Check if string matches PCRE pattern."""
-    return pcre_regex.match(s) is not None
+    return pcre_regex.fullmatch(s) is not None
 
 
 def matches_xsd(s: str) -> bool:
     """Check if string matches XSD pattern."""
-    return xsd_regex.match(s) is not None
+    return xsd_regex.fullmatch(s) is not None
 
 
 def compare(s: str) -> Tuple[bool, bool, bool]:
@@ -44,6 +49,55 @@ def compare(s: str) -> Tuple[bool, bool, bool]:
     return pcre, xsd, pcre == xsd
 
 
+# =============================================================================
+# Reference Parser
+# =============================================================================
+
+IDENTIFIER_CHARS = frozenset(string.ascii_letters + string.digits + "-")
+
+
+def is_numeric_identifier(part: str) -> bool:
+    """Digits only, without leading zeros."""
+    return part.isascii() and part.isdigit() and (part == "0" or part[0] != "0")
+
+
+def is_identifier(part: str) -> bool:
+    """Non-empty, and only made of [0-9a-zA-Z-]."""
+    return part != "" and IDENTIFIER_CHARS.issuperset(part)
+
+
+def is_prerelease_identifier(part: str) -> bool:
+    """Numeric identifier, or an identifier containing a non-digit."""
+    return is_numeric_identifier(part) or (is_identifier(part) and not part.isdigit())
+
+
+def matches_reference(s: str) -> bool:
+    """
+    Check if string is a SemVer 2.0.0 version, by splitting it into its
+    build, pre-release and core components rather than using a regex.
+    """
+    version, has_build, build = s.partition("+")
+    if has_build and not all(is_identifier(part) for part in build.split(".")):
+        return False
+    core, has_prerelease, prerelease = version.partition("-")
+    if has_prerelease and not all(
+        is_prerelease_identifier(part) for part in prerelease.split(".")
+    ):
+        return False
+    parts = core.split(".")
+    return len(parts) == 3 and all(is_numeric_identifier(part) for part in parts)
+
+
+def compare_reference(s: str) -> Tuple[bool, bool, bool]:
+    """
+    Compare the PCRE match with the reference parser.
+    Returns (pcre_match, reference_match, equivalent)
+    """
+    pcre = matches_pcre(s)
+    reference = matches_reference(s)
+    return pcre, reference, pcre == reference
+
+
 # =============================================================================
 # Test Case Generators
 # =============================================================================
@@ -198,6 +252,7 @@ def invalid_semver_examples() -> List[str]:
         # Whitespace
         " 1.2.3",
         "1.2.3 ",
+        "1.2.3\n",
         " 1.2.3 ",
         "1. 2.3",
         "1 .2.3",
@@ -338,11 +393,24 @@ def generate_malformed_version() -> str:
     return random.choice(templates)()
 
 
-def generate_completely_random() -> str:
-    """Generate completely random string."""
-    length = random.randint(0, 50)
-    chars = string.printable
-    return ''.join(random.choices(chars, k=length))
+def generate_completely_random_batch(count: int) -> List[str]:
+    """
+    Generate a batch of completely random strings of 0 to 50 printable
+    characters, sampling the characters of all of them at once.
+    """
+    lengths = random.choices(range(51), k=count)
+    chars = ''.join(random.choices(string.printable, k=sum(lengths)))
+    batch = []
+    start = 0
+    for length in lengths:
+        batch.append(chars[start:start + length])
+        start += length
+    return batch
+
+
+def generate_batch(generator, count: int) -> List[str]:
+    """Generate a batch of strings, one at a time."""
+    return [generator() for _ in range(count)]
 
 
 def generate_boundary_cases() -> List[str]:
@@ -412,17 +480,32 @@ def generate_boundary_cases() -> List[str]:
 # =============================================================================
 
 class TestResults:
-    def __init__(self):
+    # Only the first failures are listed in the summary, so only those are kept
+    MAX_FAILURES = 50
+    
+    def __init__(self, other: str = "XSD", max_failures: int = MAX_FAILURES):
+        self.other = other
         self.passed = 0
         self.failed = 0
         self.failures: List[Tuple[str, bool, bool]] = []
+        # None keeps every failure
+        self.max_failures = max_failures
     
     def add_result(self, test_input: str, pcre: bool, xsd: bool):
         if pcre == xsd:
             self.passed += 1
         else:
             self.failed += 1
-            self.failures.append((test_input, pcre, xsd))
+            if self.max_failures is None or len(self.failures) < self.max_failures:
+                self.failures.append((test_input, pcre, xsd))
+    
+    def merge(self, other: "TestResults"):
+        self.passed += other.passed
+        self.failed += other.failed
+        if self.max_failures is None:
+            self.failures.extend(other.failures)
+        else:
+            self.failures.extend(other.failures[:self.max_failures - len(self.failures)])
     
     def print_summary(self):
         total = self.passed + self.failed
@@ -431,26 +514,71 @@ class TestResults:
         print(f"{'='*60}")
         
         if self.failures:
-            print("\nFAILURES (PCRE != XSD):")
+            print(f"\nFAILURES (PCRE != {self.other}):")
             print("-" * 60)
-            for test_input, pcre, xsd in self.failures[:50]:  # Limit output
+            for test_input, pcre, xsd in self.failures:
                 print(f"  Input: {repr(test_input)}")
-                print(f"    PCRE: {pcre}, XSD: {xsd}")
-            if len(self.failures) > 50:
-                print(f"  ... and {len(self.failures) - 50} more failures")
+                print(f"    PCRE: {pcre}, {self.other}: {xsd}")
+            if self.failed > len(self.failures):
+                print(f"  ... and {self.failed - len(self.failures)} more failures")
 
 
-def run_tests(test_cases: List[str], description: str, results: TestResults, verbose: bool = False):
+def run_tests(test_cases: List[str], description: str, results: TestResults, verbose: bool = False, compare_fn=compare):
     """Run tests on a list of test cases."""
     print(f"\nTesting: {description} ({len(test_cases)} cases)")
     
+    add_result = results.add_result
     for test_input in test_cases:
-        pcre, xsd, equiv = compare(test_input)
-        results.add_result(test_input, pcre, xsd)
+        pcre, xsd, equiv = compare_fn(test_input)
+        add_result(test_input, pcre, xsd)
         
         if verbose or not equiv:
             status = "✓" if equiv else "✗"
-            print(f"  {status} {repr(test_input)}: PCRE={pcre}, XSD={xsd}")
+            print(f"  {status} {repr(test_input)}: PCRE={pcre}, {results.other}={xsd}")
+
+
+# Number of inputs each worker generates and tests at a time
+FUZZ_CHUNK_SIZE = 10_000
+
+
+def fuzz_chunk(task) -> TestResults:
+    """Generate and test a chunk of fuzz inputs, in a worker process."""
+    batch_generator, count, seed = task
+    random.seed(seed)
+    # Every failure is kept, so that run_fuzz() can print them all
+    results = TestResults(max_failures=None)
+    # Bound once, as this loop runs for every generated input
+    compare_fn = compare
+    add_result = results.add_result
+    for test_input in batch_generator(count):
+        pcre, xsd, _ = compare_fn(test_input)
+        add_result(test_input, pcre, xsd)
+    return results
+
+
+def run_fuzz(batch_generator, count: int, description: str, results: TestResults, pool: Pool):
+    """Run tests on inputs from a batch generator, in parallel chunks."""
+    print(f"\nTesting: {description} ({count} cases)")
+    # Seeds are drawn here, so that seeding the main process makes runs reproducible
+    tasks = [
+        (batch_generator, min(FUZZ_CHUNK_SIZE, count - start), random.getrandbits(64))
+        for start in range(0, count, FUZZ_CHUNK_SIZE)
+    ]
+    for chunk_results in pool.imap(fuzz_chunk, tasks):
+        for test_input, pcre, xsd in chunk_results.failures:
+            print(f"  ✗ {repr(test_input)}: PCRE={pcre}, {results.other}={xsd}")
+        results.merge(chunk_results)
+
+
+# (prefix, suffix) pairs placed around each printable character
+SINGLE_CHAR_AFFIXES = (
+    ("", ""),
+    ("1.2.3", ""),
+    ("1.2.3-", ""),
+    ("1.2.3+", ""),
+    ("1.2.3-a", "b"),
+    ("1.2.3+a", "b"),
+)
 
 
 def main():
@@ -472,46 +600,23 @@ def main():
     # 3. Test boundary cases
     run_tests(generate_boundary_cases(), "Boundary cases", results, verbose)
     
-    # 4. Fuzz with random valid-ish versions
-    num_random_versions = 100_000
-    print(f"\nTesting: Random version-like strings ({num_random_versions} cases)")
-    for _ in range(num_random_versions):
-        test_input = generate_random_version()
-        pcre, xsd, equiv = compare(test_input)
-        results.add_result(test_input, pcre, xsd)
-        if not equiv:
-            print(f"  ✗ {repr(test_input)}: PCRE={pcre}, XSD={xsd}")
+    with Pool() as pool:
+        # 4. Fuzz with random valid-ish versions
+        run_fuzz(partial(generate_batch, generate_random_version), 100_000, "Random version-like strings", results, pool)
     
-    # 5. Fuzz with malformed versions
-    num_malformed = 50_000
-    print(f"\nTesting: Malformed version strings ({num_malformed} cases)")
-    for _ in range(num_malformed):
-        test_input = generate_malformed_version()
-        pcre, xsd, equiv = compare(test_input)
-        results.add_result(test_input, pcre, xsd)
-        if not equiv:
-            print(f"  ✗ {repr(test_input)}: PCRE={pcre}, XSD={xsd}")
+        # 5. Fuzz with malformed versions
+        run_fuzz(partial(generate_batch, generate_malformed_version), 50_000, "Malformed version strings", results, pool)
     
-    # 6. Fuzz with completely random strings
-    num_random = 100_000
-    print(f"\nTesting: Completely random strings ({num_random} cases)")
-    for _ in range(num_random):
-        test_input = generate_completely_random()
-        pcre, xsd, equiv = compare(test_input)
-        results.add_result(test_input, pcre, xsd)
-        if not equiv:
-            print(f"  ✗ {repr(test_input)}: PCRE={pcre}, XSD={xsd}")
+        # 6. Fuzz with completely random strings
+        run_fuzz(generate_completely_random_batch, 100_000, "Completely random strings", results, pool)
     
     # 7. Test all single-character variations
     print("\nTesting: Single character edge cases")
-    single_char_cases = []
-    for c in string.printable:
-        single_char_cases.append(c)
-        single_char_cases.append(f"1.2.3{c}")
-        single_char_cases.append(f"1.2.3-{c}")
-        single_char_cases.append(f"1.2.3+{c}")
-        single_char_cases.append(f"1.2.3-a{c}b")
-        single_char_cases.append(f"1.2.3+a{c}b")
+    single_char_cases = [
+        prefix + c + suffix
+        for c in string.printable
+        for prefix, suffix in SINGLE_CHAR_AFFIXES
+    ]
     
     for test_input in single_char_cases:
         pcre, xsd, equiv = compare(test_input)
@@ -521,13 +626,13 @@ def main():
     
     # 8. Test various combinations of dots and hyphens
     print("\nTesting: Dot and hyphen combinations")
-    combos = []
-    for dots in range(0, 6):
-        for hyphens in range(0, 4):
-            base = "1.2.3-" + "." * dots + "-" * hyphens
-            combos.append(base)
-            combos.append(base + "a")
-            combos.append("a" + base)
+    combos = [
+        variant
+        for dots in range(0, 6)
+        for hyphens in range(0, 4)
+        for base in ["1.2.3-" + "." * dots + "-" * hyphens]
+        for variant in (base, base + "a", "a" + base)
+    ]
     
     for test_input in combos:
         pcre, xsd, equiv = compare(test_input)
@@ -535,11 +640,24 @@ def main():
         if not equiv:
             print(f"  ✗ {repr(test_input)}: PCRE={pcre}, XSD={xsd}")
     
+    # 9. Cross-check the PCRE pattern against the hand-written parser
+    reference_results = TestResults(other="Parser")
+    reference_cases = (
+        valid_semver_examples()
+        + invalid_semver_examples()
+        + generate_boundary_cases()
+        + [generate_random_version() for _ in range(10_000)]
+        + [generate_malformed_version() for _ in range(10_000)]
+        + generate_completely_random_batch(10_000)
+    )
+    run_tests(reference_cases, "Hand-written parser cross-check", reference_results, verbose, compare_reference)
+    
     # Print final summary
     results.print_summary()
+    reference_results.print_summary()
     
     # Return exit code based on results
-    return 0 if results.failed == 0 else 1
+    return 0 if results.failed == 0 and reference_results.failed == 0 else 1
 
 
 if __name__ == "__main__":
@@ -8,78 +8,124 @@ TODO:
 """
 
 import json
+import operator
 import re
 import sys
 import pathlib
 
+try:
+    import orjson
+
+    load_json = orjson.loads
+except ImportError:
+    load_json = json.loads
+
 
 def traverse(schema):
-    for key, value in schema.items():
-        if isinstance(value, dict):
-            yield from traverse(value)
-        elif isinstance(value, list):
-            for item in value:
-                if isinstance(item, dict):
-                    yield from traverse(item)
-        else:
-            yield key, value
+    # Explicit stack rather than recursion, leaves are not yielded in document order
+    stack = [schema]
+    while stack:
+        node = stack.pop()
+        for key, value in node.items():
+            if isinstance(value, dict):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(item for item in value if isinstance(item, dict))
+            else:
+                yield key, value
 
 
 def refs(node):
+    # Same walk as traverse(), counting in place rather than yielding every leaf
     count = 0
-    for key, _ in traverse(node):
-        if key == "$ref":
-            count += 1
+    stack = [node]
+    while stack:
+        for key, value in stack.pop().items():
+            if isinstance(value, dict):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(item for item in value if isinstance(item, dict))
+            elif key == "$ref":
+                count += 1
     return count
 
 
-def totalrefs(name, defs):
+def ref_targets(defs):
+    # Each definition is walked once, reachability is then computed on the
+    # resulting graph of definition names rather than on the schemas
+    return {
+        name: [
+            value.rpartition("/")[2] for key, value in traverse(node) if key == "$ref"
+        ]
+        for name, node in defs.items()
+    }
+
+
+def totalrefs(name, targets):
     count = 0
-    seen = set()
-    unresolved = {name}
+    seen = {name}
+    unresolved = [name]
     while unresolved:
-        node_name = unresolved.pop()
-        seen.add(node_name)
-        node = defs[node_name]
-        for key, value in traverse(node):
-            if key == "$ref":
-                count += 1
-                refname = value.split("/")[-1]
-                if refname not in seen:
-                    unresolved.add(refname)
+        node_targets = targets[unresolved.pop()]
+        count += len(node_targets)
+        for refname in node_targets:
+            if refname not in seen:
+                seen.add(refname)
+                unresolved.append(refname)
     return count
 
 
-def types_with_no_refs(schema):
-    return {name: node for name, node in schema["$defs"].items() if refs(node) == 0}
+def ref_counts(schema):
+    return {name: refs(node) for name, node in schema["$defs"].items()}
 
 
 def stats(schema):
+    # Definitions are walked once, and their counts reused for both totals
+    counts = ref_counts(schema)
+    outside_defs = {key: value for key, value in schema.items() if key != "$defs"}
     print(f"; {len(schema['$defs'])} definitions")
-    print(f"; {refs(schema)} references")
-    types_with_no_refs_count = len(types_with_no_refs(schema))
+    print(f"; {refs(outside_defs) + sum(counts.values())} references")
+    types_with_no_refs_count = sum(1 for count in counts.values() if count == 0)
     print(f"; {types_with_no_refs_count} types with no references")
     print()
 
 
+# Keys allowed by each type class, built once rather than for every is_one() call
+STRING_KEYS = frozenset({"type", "pattern", "allOf"})
+NUMERIC_KEYS = frozenset({"type", "minimum", "maximum"})
+ARRAY_KEYS = frozenset({"type", "items", "minItems", "description"})
+OBJECT_KEYS = frozenset(
+    {"type", "unevaluatedProperties", "anyOf", "required", "properties"}
+)
+CONST_KEYS = frozenset({"const"})
+ENUM_KEYS = frozenset({"enum"})
+NOT_KEYS = frozenset({"not"})
+ANY_OF_KEYS = frozenset({"anyOf"})
+ALL_OF_KEYS = frozenset({"allOf"})
+PATTERN_KEYS = frozenset({"pattern"})
+REF_KEYS = frozenset({"$ref"})
+TYPED_REF_KEYS = frozenset({"$ref", "type", "unevaluatedProperties"})
+IF_THEN_ELSE_KEYS = frozenset({"if", "then", "else"})
+IF_THEN_ELSE_OBJECT_KEYS = frozenset(
+    {"type", "unevaluatedProperties", "required", "properties"}
+) | IF_THEN_ELSE_KEYS
+
+
 def declaration(name, schema, klass):
     return f"{name} = {klass.cddl(schema)}"
 
 
+def escape_pattern(pattern):
+    return pattern.replace("\\", "\\\\")
+
+
 class StringType:
     @staticmethod
     def is_one(schema):
-        return schema.get("type") == "string" and {
-            "type",
-            "pattern",
-            "allOf",
-        }.issuperset(schema.keys())
+        return schema.get("type") == "string" and schema.keys() <= STRING_KEYS
 
     @staticmethod
     def cddl(schema):
-        def escape_pattern(pattern):
-            return pattern.replace("\\", "\\\\")
-
         if "pattern" in schema:
             # \ needs to be escaped in CDDL regexps
             pattern = escape_pattern(schema["pattern"])
@@ -88,7 +134,7 @@ class StringType:
         if "allOf" in schema:
             patterns = []
             for value in schema["allOf"]:
-                assert value.keys() == {"pattern"}
+                assert value.keys() == PATTERN_KEYS
                 pattern = escape_pattern(value["pattern"])
                 patterns.append(f'tstr .regexp "{pattern}"')
             return " / ".join(patterns)
@@ -96,6 +142,9 @@ class StringType:
         return "tstr"
 
 
+ESCAPE_TABLE = str.maketrans({":": "_", "/": "_"})
+
+
 class ContiguousInternedEntries:
     def __init__(self, prefix, offset):
         self.prefix = prefix
@@ -103,29 +152,36 @@ class ContiguousInternedEntries:
         self.latest_index = offset
         self.entries = {}
         self.unescaped_entries = set()
+        # Entries are looked up repeatedly, this avoids escaping them every time
+        self.interned_names = {}
 
     def escape_name(self, name):
         # The space of possible JSON strings is greater than valid CDDL identifiers.
         # This is not a general escaping mechanism, but aims to cover SPDX values,
         # and keeps track of already-escaped entries to detect any collisions.
-        escaped = name.replace(":", "_").replace("/", "_")
+        escaped = name.translate(ESCAPE_TABLE)
         if escaped in self.entries and escaped not in self.unescaped_entries:
             raise ValueError(f"Name collision after escaping: {name} -> {escaped}")
         self.unescaped_entries.add(escaped)
         return escaped
 
     def get(self, entry):
+        if entry in self.interned_names:
+            return self.interned_names[entry]
         interned_name = self.escape_name(f"{self.prefix}.{entry}")
         if not interned_name in self.entries:
             self.latest_index += 1
             self.entries[interned_name] = self.latest_index
+        self.interned_names[entry] = interned_name
         return interned_name
 
     def definitions(self):
         return "\n".join(
             [
                 f"{name} = {index}"
-                for name, index in sorted(self.entries.items(), key=lambda x: x[1])
+                for name, index in sorted(
+                    self.entries.items(), key=operator.itemgetter(1)
+                )
             ]
         )
 
@@ -139,7 +195,7 @@ class ContiguousInternedLabels(ContiguousInternedEntries):
 
     def definitions(self, grouping):
         text = ""
-        for name, index in sorted(self.entries.items(), key=lambda x: x[1]):
+        for name, index in sorted(self.entries.items(), key=operator.itemgetter(1)):
             prefix, full_name = name.split(".", 1)
             assert prefix == self.prefix
             if "_" in full_name:
@@ -162,28 +218,24 @@ def drop_weaker_constraints(seq):
     parts = seq.split(", ")
     defined = set()
     weaker = {}
-    pos = 0
-    for part in parts:
-        if " => " in part:
-            label, value = part.split(" => ")
+    for pos, part in enumerate(parts):
+        # Single scan of each part, rather than a search followed by a split
+        label, arrow, value = part.partition(" => ")
+        if arrow:
             if label.startswith("?"):
                 weaker[label[1:]] = pos
             elif value == "any":
                 weaker[label] = pos
             else:
                 defined.add(label)
-        pos += 1
-    dropped_weaker = {
-        label: position for label, position in weaker.items() if label in defined
-    }
-    kept = [part for i, part in enumerate(parts) if i not in dropped_weaker.values()]
-    return ", ".join(kept)
+    dropped = {position for label, position in weaker.items() if label in defined}
+    return ", ".join(part for i, part in enumerate(parts) if i not in dropped)
 
 
 class ConstType:
     @staticmethod
     def is_one(schema):
-        return schema.keys() == {"const"}
+        return schema.keys() == CONST_KEYS
 
     @staticmethod
     def cddl(schema):
@@ -193,11 +245,7 @@ class ConstType:
 class NumberType:
     @staticmethod
     def is_one(schema):
-        return schema.get("type") == "number" and {
-            "type",
-            "minimum",
-            "maximum",
-        }.issuperset(schema.keys())
+        return schema.get("type") == "number" and schema.keys() <= NUMERIC_KEYS
 
     @staticmethod
     def cddl(schema):
@@ -212,11 +260,7 @@ class NumberType:
 class IntegerType:
     @staticmethod
     def is_one(schema):
-        return schema.get("type") == "integer" and {
-            "type",
-            "minimum",
-            "maximum",
-        }.issuperset(schema.keys())
+        return schema.get("type") == "integer" and schema.keys() <= NUMERIC_KEYS
 
     @staticmethod
     def cddl(schema):
@@ -234,12 +278,7 @@ class IntegerType:
 class ArrayType:
     @staticmethod
     def is_one(schema):
-        return schema.get("type") == "array" and {
-            "type",
-            "items",
-            "minItems",
-            "description",
-        }.issuperset(schema.keys())
+        return schema.get("type") == "array" and schema.keys() <= ARRAY_KEYS
 
     @staticmethod
     def cddl(schema):
@@ -268,12 +307,16 @@ class BooleanType:
 class AnyOfType:
     @staticmethod
     def is_one(schema):
-        return schema.keys() == {"anyOf"}
+        return schema.keys() == ANY_OF_KEYS
 
     @staticmethod
     def cddl(schema):
+        return AnyOfType.alternatives(schema["anyOf"])
+
+    @staticmethod
+    def alternatives(subschemas):
         parts = []
-        for subschema in schema["anyOf"]:
+        for subschema in subschemas:
             type_class = find_type(subschema)
             if type_class is None:
                 raise NotImplementedError(
@@ -287,7 +330,7 @@ class AnyOfType:
 class IfThenElseType:
     @staticmethod
     def is_one(schema):
-        return schema.keys() == {"if", "then", "else"}
+        return schema.keys() == IF_THEN_ELSE_KEYS
 
     @staticmethod
     def cddl(schema):
@@ -304,7 +347,7 @@ class IfThenElseType:
         parts.append(type_class.cddl(schema["then"], unwrap=True))
         else_schema = schema["else"]
         if else_schema:
-            assert schema["else"].keys() == {"const"}
+            assert schema["else"].keys() == CONST_KEYS
             assert schema["else"]["const"].startswith("Not a")
         return f"{{ {drop_weaker_constraints(', '.join(parts))} }}"
 
@@ -312,7 +355,7 @@ class IfThenElseType:
 class EnumType:
     @staticmethod
     def is_one(schema):
-        return schema.keys() == {"enum"}
+        return schema.keys() == ENUM_KEYS
 
     @staticmethod
     def cddl(schema):
@@ -328,7 +371,7 @@ class EnumType:
 class NotConstType:
     @staticmethod
     def is_one(schema):
-        return schema.keys() == {"not"} and ConstType.is_one(schema["not"])
+        return schema.keys() == NOT_KEYS and ConstType.is_one(schema["not"])
 
     @staticmethod
     def cddl(schema, unwrap=False):
@@ -341,14 +384,14 @@ class RefType:
     @staticmethod
     def is_one(schema):
         return (
-            schema.keys() == {"$ref"}
-            or schema.keys() == {"$ref", "type", "unevaluatedProperties"}
+            schema.keys() == REF_KEYS
+            or schema.keys() == TYPED_REF_KEYS
             and schema.get("type") == "object"
         )
 
     @staticmethod
     def cddl(schema, unwrap=False):
-        defs, ref_name = schema["$ref"].rsplit("/", 1)
+        defs, _, ref_name = schema["$ref"].rpartition("/")
         assert defs == "#/$defs"
         return f"~{ref_name}" if unwrap else ref_name
 
@@ -356,7 +399,7 @@ class RefType:
 class AllOfType:
     @staticmethod
     def is_one(schema):
-        return schema.keys() == {"allOf"}
+        return schema.keys() == ALL_OF_KEYS
 
     @staticmethod
     def cddl(schema, unwrap=False):
@@ -377,29 +420,24 @@ class ObjectType:
     def is_one(schema):
         return (
             schema.get("type") == "object"
-            and {
-                "type",
-                "unevaluatedProperties",
-                "anyOf",
-                "required",
-                "properties",
-            }.issuperset(schema.keys())
-            and sum(["properties" in schema, "anyOf" in schema]) <= 1
+            and schema.keys() <= OBJECT_KEYS
+            and not ("properties" in schema and "anyOf" in schema)
         )
 
     @staticmethod
     def cddl(schema, unwrap=False):
         if "anyOf" in schema:
-            return AnyOfType.cddl({"anyOf": schema["anyOf"]})
+            return AnyOfType.alternatives(schema["anyOf"])
         if "properties" in schema:
             parts = []
+            required = set(schema.get("required", ()))
             for prop_name, prop_schema in schema["properties"].items():
                 type_class = find_type(prop_schema)
                 if type_class is None:
                     raise NotImplementedError(
                         f"Unsupported property schema: {prop_schema}"
                     )
-                optionality = "?" if prop_name not in schema.get("required", []) else ""
+                optionality = "?" if prop_name not in required else ""
                 interned_prop_name = LABELS.get(prop_name)
                 parts.append(
                     f"{optionality}{interned_prop_name} => {type_class.cddl(prop_schema)}"
@@ -426,16 +464,8 @@ class IfThenElseObjectType:
     def is_one(schema):
         return (
             schema.get("type") == "object"
-            and {
-                "type",
-                "unevaluatedProperties",
-                "required",
-                "properties",
-                "if",
-                "then",
-                "else",
-            }.issuperset(schema.keys())
-            and {"if", "then", "else"}.issubset(schema.keys())
+            and schema.keys() <= IF_THEN_ELSE_OBJECT_KEYS
+            and IF_THEN_ELSE_KEYS <= schema.keys()
         )
 
     @staticmethod
@@ -462,23 +492,67 @@ class IfThenElseObjectType:
         return f"{{ {drop_weaker_constraints(', '.join(first_part))} }} / {{ {drop_weaker_constraints(', '.join(second_part))} }}"
 
 
+FIND_TYPE_CACHE = {}
+
+
 def find_type(schema):
-    for type_class in [
-        StringType,
-        NumberType,
-        IntegerType,
+    # Apart from NotConstType, which also looks at its subschema, type classes
+    # only depend on which keys are present and on the value of "type"
+    type_value = schema.get("type")
+    if "not" in schema or not (type_value is None or isinstance(type_value, str)):
+        return find_type_uncached(schema)
+    key = (frozenset(schema.keys()), type_value)
+    if key not in FIND_TYPE_CACHE:
+        FIND_TYPE_CACHE[key] = find_type_uncached(schema)
+    return FIND_TYPE_CACHE[key]
+
+
+# Type classes in the order they are tried
+TYPE_CLASSES = (
+    StringType,
+    NumberType,
+    IntegerType,
+    AnyOfType,
+    EnumType,
+    BooleanType,
+    RefType,
+    ConstType,
+    ObjectType,
+    AllOfType,
+    ArrayType,
+    IfThenElseType,
+    NotConstType,
+    IfThenElseObjectType,
+)
+
+# The subset of TYPE_CLASSES, in the same order, that can accept a given value
+# of "type". Classes that do not look at "type" only accept schemas without one.
+TYPE_CLASSES_BY_TYPE = {
+    "string": (StringType,),
+    "number": (NumberType,),
+    "integer": (IntegerType,),
+    "boolean": (BooleanType,),
+    "array": (ArrayType,),
+    "object": (RefType, ObjectType, IfThenElseObjectType),
+    None: (
         AnyOfType,
         EnumType,
-        BooleanType,
         RefType,
         ConstType,
-        ObjectType,
         AllOfType,
-        ArrayType,
         IfThenElseType,
         NotConstType,
-        IfThenElseObjectType,
-    ]:
+    ),
+}
+
+
+def find_type_uncached(schema):
+    type_value = schema.get("type")
+    if type_value is None or isinstance(type_value, str):
+        candidates = TYPE_CLASSES_BY_TYPE.get(type_value, ())
+    else:
+        candidates = TYPE_CLASSES
+    for type_class in candidates:
         if type_class.is_one(schema):
             return type_class
     return None
@@ -499,11 +573,11 @@ class Grouping:
         "Extension",
     ]
 
-    profiles = {}
-
     def __init__(self, defs):
         self.defs = defs
         self.profile_map = {}
+        # Profiles are emitted in insertion order, including empty ones
+        self.profiles = {}
         for profile_name in self._PROFILES_NAMES:
             self.profile_map[profile_name.lower()] = profile_name
             self.profile_map[f"prop_{profile_name.lower()}"] = profile_name
@@ -511,13 +585,13 @@ class Grouping:
 
         self.profiles["Core"] = []
 
+        # No profile key is a prefix of another, so names match at most one key
+        profile_prefix = re.compile("|".join(map(re.escape, self.profile_map)))
         for name, schema in defs.items():
-            core = True
-            for key in self.profile_map.keys():
-                if name.startswith(key):
-                    self.profiles[self.profile_map[key]].append((name, schema))
-                    core = False
-            if core:
+            match = profile_prefix.match(name)
+            if match:
+                self.profiles[self.profile_map[match.group()]].append((name, schema))
+            else:
                 self.profiles["Core"].append((name, schema))
 
     def to_profile(self, lower):
@@ -569,23 +643,25 @@ if __name__ == "__main__":
     schema_path = pathlib.Path(__file__).parent / "spdx-json-schema.json"
     if len(sys.argv) == 2:
         schema_path = pathlib.Path(sys.argv[1])
-    schema = json.loads(schema_path.read_text())
+    schema = load_json(schema_path.read_bytes())
     unmapped = []
     toplevel = {key: value for key, value in schema.items() if not key.startswith("$")}
-    print(
+    # Output is collected and written in one go, rather than line by line
+    out = []
+    out.append(
         "; https://raw.githubusercontent.com/achamayou/draft-chamayou-cospdx/refs/heads/main/cospdx.cddl"
     )
-    print("; Entry Point")
-    print(declaration("SPDX_Document", toplevel, find_type(toplevel)))
-    print()
+    out.append("; Entry Point")
+    out.append(declaration("SPDX_Document", toplevel, find_type(toplevel)))
+    out.append("")
 
     grouping = Grouping(schema["$defs"])
 
     for profile_name, definitions in grouping.profiles.items():
         if definitions:
             # Not all profiles define types
-            print(f"; {profile_name} Profile")
-            print()
+            out.append(f"; {profile_name} Profile")
+            out.append("")
             for type_name, type_schema in definitions:
                 type_class = find_type(type_schema)
                 if type_class is None:
@@ -593,23 +669,23 @@ if __name__ == "__main__":
                 else:
                     # Special casing, either for canonicality or for future extensibility
                     if type_name in DIGESTVALUE_TYPES:
-                        print(
+                        out.append(
                             f"{type_name}_wrapped = #6.108(bstr) ; Strings in SPDX-JSON, usually hex-encoded"
                         )
-                        print(f"{type_name} = ~{type_name}_wrapped")
+                        out.append(f"{type_name} = ~{type_name}_wrapped")
                     elif type_name in DATETIME_TYPES:
-                        print(
+                        out.append(
                             f"{type_name} = #6.1(uint) ; ISO8601 UTC with second-precision strings in SPDX-JSON"
                         )
                     elif type_name in EXTENSIBLE_TYPES:
-                        print(
+                        out.append(
                             f"{type_name} = ${type_name} ; Socket for eventual post-SPDX 3.0.1 extensions"
                         )
                         values = type_class.cddl(type_schema).split(" / ")
                         for value in values:
-                            print(f"${type_name} /= {value}")
+                            out.append(f"${type_name} /= {value}")
                     elif type_name == "SHACLClass":
-                        print(
+                        out.append(
                             f"{type_name} = {{ label.type => $label.type }} ; Socket for eventual post-SPDX 3.0.1 extensions"
                         )
                         label_type_values = (
@@ -619,56 +695,60 @@ if __name__ == "__main__":
                             .split(" / ")
                         )
                         for value in label_type_values:
-                            print(f"$label.type /= {value}")
+                            out.append(f"$label.type /= {value}")
                     elif type_name in QUANTITY_TYPES:
                         # SPDX allows either float, or strings matching "^-?[0-9]+(\\.[0-9]*)?$"
                         # CoSPDX must make a choice for canonicality, and chooses the string representation
                         # because it avoids precision issues if the document is converted to SPDX JSON.
                         # The regexp is converted to its CDDL/XSD equivalent (https://www.rfc-editor.org/rfc/rfc8610#section-3.8.3)
-                        print(
+                        out.append(
                             f'{type_name} = tstr .regexp "-?[0-9]+(\\\\.[0-9]*)?" ; CoSPDX representation of quantities'
                         )
                     elif type_name == "BlankNode":
                         # SPDX JSON pattern is "^_:.+", but CDDL regexp are matches, and we assume that the intention is not
                         # to match any line returns.
-                        print(
+                        out.append(
                             f'{type_name} = tstr .regexp "_:.+" ; CoSPDX representation of blank nodes'
                         )
                     elif type_name in CONTENT_TYPES:
                         # SPDX JSON pattern is "^[^\\/]+\\/[^\\/]+$", but CDDL regexp are matches and the double escaping is not needed.
-                        print(
+                        out.append(
                             f'{type_name} = tstr .regexp "[^/]+/[^/]+" ; CoSPDX representation of content types'
                         )
                     elif type_name == "IRI":
                         # SPDX JSON pattern is "^(?!_:).+:.+", but CDDL regexp are matches and do not support lookaheads.
                         # See fuzz_iri_regex.py for testing the equivalence of the patterns.
-                        print(
+                        out.append(
                             f'{type_name} = tstr .regexp "[^_].*:.+|_[^:].*:.+" ; CoSPDX representation of IRIs'
                         )
                     elif type_name in SEMVER_TYPES:
                         # SPDX JSON pattern to match SemVer, but CDDL regexp are matches and do not support lookaheads.
                         # See fuzz_semver_regex.py for testing the equivalence of the patterns.
-                        print(
+                        out.append(
                             f'{type_name} = tstr .regexp "(0|[1-9][0-9]*)\\\\.(0|[1-9][0-9]*)\\\\.(0|[1-9][0-9]*)(-((0|[1-9][0-9]*|[0-9]*[a-zA-Z-][0-9a-zA-Z-]*)(\\\\.(0|[1-9][0-9]*|[0-9]*[a-zA-Z-][0-9a-zA-Z-]*))*))?(\\\\+([0-9a-zA-Z-]+(\\\\.[0-9a-zA-Z-]+)*))?" ; CoSPDX representation of versions'
                         )
                     else:
-                        print(declaration(type_name, type_schema, type_class))
-            print()
-
-    print("AnyObject = { * any => any }")
-    print()
-    print(f"; {LABELS.description()}")
-    print(LABELS.definitions(grouping))
-    print()
-    print(f"; {CONSTS.description()}")
-    print(CONSTS.definitions())
-
-    unmapped_and_totalrefs = sorted(
-        [
-            (type_name, type_schema, totalrefs(type_name, schema["$defs"]))
-            for type_name, type_schema in unmapped
-        ],
-        reverse=True,
-        key=lambda x: x[2],
-    )
-    assert not unmapped_and_totalrefs, unmapped_and_totalrefs
+                        out.append(declaration(type_name, type_schema, type_class))
+            out.append("")
+
+    out.append("AnyObject = { * any => any }")
+    out.append("")
+    out.append(f"; {LABELS.description()}")
+    out.append(LABELS.definitions(grouping))
+    out.append("")
+    out.append(f"; {CONSTS.description()}")
+    out.append(CONSTS.definitions())
+    sys.stdout.write("\n".join(out) + "\n")
+
+    if unmapped:
+        # Reference counts are only needed to report unmapped types, most referenced first
+        targets = ref_targets(schema["$defs"])
+        unmapped_and_totalrefs = sorted(
+            [
+                (type_name, type_schema, totalrefs(type_name, targets))
+                for type_name, type_schema in unmapped
+            ],
+            reverse=True,
+            key=operator.itemgetter(2),
+        )
+        raise AssertionError(unmapped_and_totalrefs)